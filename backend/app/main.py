@@ -1,41 +1,102 @@
 import os
+import sys
+import math
+import asyncio
 import time
+import uuid
+import pickle
 import shutil
-from fastapi import FastAPI, File, UploadFile, HTTPException, Form
+import threading
+from functools import lru_cache
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from typing import List, Optional
-import json
+from typing import Dict, List, Optional
+import aiofiles
+import httpx
 from dotenv import load_dotenv
+from tenacity import retry, stop_after_attempt, wait_exponential
 
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
-from langchain_classic.chains import RetrievalQAWithSourcesChain
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_community.vectorstores import FAISS
-
-from langchain_community.document_loaders import (
-    UnstructuredURLLoader,
-    PyPDFLoader,
-    CSVLoader,
-    TextLoader,
-    UnstructuredFileLoader
-)
+# Heavy dependencies (faiss, numpy, langchain integrations, document
+# loaders) are imported inside the functions that use them to keep
+# worker startup time and per-process memory down.
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 
 # =========================
 # Config
 # =========================
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 FAISS_PATH = "faiss_store"
 TEMP_DIR = "temp_files"
+# Chunk embeddings keyed by content hash; survives /reset so re-ingesting
+# the same sources skips the embedding calls.
+EMBEDDING_CACHE_PATH = "emb_cache"
+
+# IVF+PQ index tuning: number of inverted lists probed per query and
+# number of PQ sub-quantizers (must divide the embedding dimension).
+FAISS_NPROBE = int(os.getenv("FAISS_NPROBE", "16"))
+FAISS_PQ_M = int(os.getenv("FAISS_PQ_M", "64"))
+
+# Vector compression for the index: "pq" (IVF+PQ), "int8" (HNSW over
+# 8-bit scalar-quantized vectors) or "none" (exact fp32 flat index).
+FAISS_QUANTIZATION = os.getenv("FAISS_QUANTIZATION", "pq").lower()
+FAISS_HNSW_M = 32
+FAISS_EF_SEARCH = int(os.getenv("FAISS_EF_SEARCH", "64"))
+
+# Distinct questions whose query embeddings are kept in memory
+QUERY_EMBEDDING_CACHE_SIZE = 1024
+
+# Texts per embedding request and max requests in flight during ingest
+EMBED_BATCH_SIZE = 512
+EMBED_CONCURRENCY = 8
+INGEST_BATCH_SIZE = EMBED_BATCH_SIZE * EMBED_CONCURRENCY
+
+# Ingest and query traffic use separate OpenAI connection pools (and may
+# point at separate deployments) so a large ingest can't stall /query.
+OPENAI_API_BASE_INGEST = os.getenv("OPENAI_API_BASE_INGEST", os.getenv("OPENAI_API_BASE"))
+OPENAI_API_BASE_QUERY = os.getenv("OPENAI_API_BASE_QUERY", os.getenv("OPENAI_API_BASE"))
+INGEST_MAX_CONNECTIONS = 32
+QUERY_MAX_CONNECTIONS = 8
+
+# Document loader class per file extension; anything else goes to
+# UnstructuredFileLoader. Filled on first use so the loaders import lazily.
+LOADERS = {}
+
+# Max URLs/files fetched and parsed in parallel
+LOADER_WORKERS = 16
 
 os.makedirs(TEMP_DIR, exist_ok=True)
 
+# Process-wide cache for the loaded vectorstore and its clients.
+# Keyed by the mtime of the persisted index; reset by build/reset.
+_VS_CACHE = {"mtime": None, "store": None, "emb": None, "llm": None}
+
+# Guards the on-disk index: the staging swap in build_vectorstore and
+# reads in load_vectorstore never interleave.
+_INDEX_LOCK = threading.Lock()
+
+# In-memory registry of background ingest jobs; once MAX_JOBS is reached
+# the oldest finished jobs are evicted.
+JOBS: Dict[str, "JobStatus"] = {}
+MAX_JOBS = 100
+
+# Background ingests run in separate threadpool threads; builds are
+# serialized so concurrent jobs don't overwrite each other mid-build.
+_INGEST_LOCK = threading.Lock()
+
 app = FastAPI(
     title="InsightForce",
     description="AI-Powered Document & Web Research Assistant",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -56,62 +117,426 @@ class ProcessSourcesRequest(BaseModel):
 class QueryRequest(BaseModel):
     question: str
 
+class ProcessResponse(BaseModel):
+    status: str
+    message: str
+    documents_loaded: int
+    urls_processed: int
+    files_processed: int
+
+class JobResponse(BaseModel):
+    status: str
+    job_id: str
+
+class JobStatus(BaseModel):
+    job_id: str
+    status: str
+    message: str
+    result: Optional[ProcessResponse] = None
+
+class QueryResponse(BaseModel):
+    status: str
+    answer: str
+    sources: List[str]
+
+class StatusResponse(BaseModel):
+    status: str
+    message: str
+
 # =========================
 # Helpers
 # =========================
-def save_uploaded_file(uploaded_file):
-    file_path = os.path.join(TEMP_DIR, uploaded_file.filename)
-    with open(file_path, "wb") as f:
-        content = uploaded_file.file.read()
-        f.write(content)
+class CachedQueryEmbeddings(Embeddings):
+    """
+    Query-side embeddings with an LRU cache on the question text,
+    so repeated questions skip the embedding API call.
+    """
+
+    def __init__(self, embeddings: Embeddings, maxsize: int = QUERY_EMBEDDING_CACHE_SIZE):
+        self.embeddings = embeddings
+        self._embed_query = lru_cache(maxsize=maxsize)(lambda text: tuple(embeddings.embed_query(text)))
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return list(self._embed_query(text))
+
+
+UPLOAD_CHUNK_SIZE = 1 << 20
+# Uploads above this size are copied in-kernel with sendfile on Linux
+SENDFILE_THRESHOLD = 4 << 20
+
+
+def _sendfile_copy(src, file_path: str, size: int):
+    in_fd = src.fileno()
+    with open(file_path, "wb") as out:
+        offset = 0
+        while offset < size:
+            sent = os.sendfile(out.fileno(), in_fd, offset, size - offset)
+            if sent == 0:
+                break
+            offset += sent
+
+
+def job_upload_dir(job_id: str):
+    # Each ingest job gets its own upload directory so queued jobs never
+    # share (and overwrite) files with the same name.
+    return os.path.join(TEMP_DIR, job_id)
+
+
+async def save_uploaded_file(uploaded_file, upload_dir: str):
+    file_path = os.path.join(upload_dir, uploaded_file.filename)
+
+    # Large uploads are already spooled to a temp file on disk, so copy
+    # them file-to-file without passing the data through Python.
+    size = uploaded_file.size or 0
+    if size > SENDFILE_THRESHOLD and sys.platform.startswith("linux"):
+        await run_in_threadpool(_sendfile_copy, uploaded_file.file, file_path, size)
+        return file_path
+
+    async with aiofiles.open(file_path, "wb") as f:
+        while chunk := await uploaded_file.read(UPLOAD_CHUNK_SIZE):
+            await f.write(chunk)
     return file_path
 
 
+def _file_loader(file_path: str):
+    from langchain_community.document_loaders import (
+        PyPDFLoader,
+        CSVLoader,
+        TextLoader,
+        UnstructuredFileLoader
+    )
+
+    if not LOADERS:
+        LOADERS.update({".pdf": PyPDFLoader, ".csv": CSVLoader, ".txt": TextLoader})
+
+    ext = os.path.splitext(file_path)[1].lower()
+    return LOADERS.get(ext, UnstructuredFileLoader)(file_path)
+
+
 def load_documents(urls: List[str], uploaded_files: List[str]):
-    documents = []
+    from langchain_community.document_loaders import UnstructuredURLLoader
+
+    # One loader per URL/file so each source is fetched and parsed in parallel
+    jobs = []
 
-    # Load URLs
     valid_urls = [url for url in urls if url.strip()]
-    if valid_urls:
-        loader = UnstructuredURLLoader(urls=valid_urls)
-        documents.extend(loader.load())
+    for url in valid_urls:
+        jobs.append((url, lambda url=url: UnstructuredURLLoader(urls=[url])))
 
-    # Load Files
     for file_path in uploaded_files or []:
         if not os.path.exists(file_path):
             continue
+        jobs.append((file_path, lambda file_path=file_path: _file_loader(file_path)))
 
-        if file_path.endswith(".pdf"):
-            loader = PyPDFLoader(file_path)
-        elif file_path.endswith(".csv"):
-            loader = CSVLoader(file_path)
-        elif file_path.endswith(".txt"):
-            loader = TextLoader(file_path)
-        else:
-            loader = UnstructuredFileLoader(file_path)
+    documents = []
+    if not jobs:
+        return documents
 
-        documents.extend(loader.load())
+    with ThreadPoolExecutor(max_workers=min(LOADER_WORKERS, len(jobs))) as executor:
+        futures = [(source, executor.submit(lambda factory: factory().load(), factory)) for source, factory in jobs]
+        for source, future in futures:
+            try:
+                documents.extend(future.result())
+            except Exception as e:
+                logger.warning("Failed to load %s: %s", source, e)
 
     return documents
 
 
-def build_vectorstore(documents):
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=1000,
-        chunk_overlap=200,
-        separators=["\n\n", "\n", ".", ","]
+@retry(stop=stop_after_attempt(3), wait=wait_exponential(min=1, max=10), reraise=True)
+async def _embed_batch(texts, embeddings):
+    return await embeddings.aembed_documents(texts)
+
+
+async def _embed_all(texts, embeddings, batch=EMBED_BATCH_SIZE, concurrency=EMBED_CONCURRENCY):
+    """
+    Embed texts in fixed-size batches with a bounded number of concurrent
+    requests. Results are returned in the same order as the input.
+    """
+    sem = asyncio.Semaphore(concurrency)
+
+    async def run(batch_texts):
+        async with sem:
+            return await _embed_batch(batch_texts, embeddings)
+
+    batches = [texts[i:i + batch] for i in range(0, len(texts), batch)]
+    results = await asyncio.gather(*(run(b) for b in batches))
+    return [vec for batch_vecs in results for vec in batch_vecs]
+
+
+def build_index(vectors, quantization=FAISS_QUANTIZATION):
+    """
+    Build a FAISS index over the embedding matrix.
+    "pq" uses IVF+PQ once there are enough vectors to train the coarse
+    quantizer, "int8" uses HNSW with 8-bit scalar quantization, and
+    anything else (or a too-small corpus for PQ) gets an exact flat index.
+    """
+    import faiss
+
+    n, d = vectors.shape
+    nlist = min(4 * int(math.sqrt(n)), 4096)
+
+    if quantization == "int8":
+        index = faiss.IndexHNSWSQ(d, faiss.ScalarQuantizer.QT_8bit, FAISS_HNSW_M)
+        index.train(vectors)
+    elif quantization != "pq" or n < 39 * nlist or d % FAISS_PQ_M != 0:
+        index = faiss.IndexFlatL2(d)
+    else:
+        quantizer = faiss.IndexFlatL2(d)
+        index = faiss.IndexIVFPQ(quantizer, d, nlist, FAISS_PQ_M, 8)
+        index.train(vectors)
+        index.nprobe = FAISS_NPROBE
+
+    index.add(vectors)
+    return index
+
+
+def _iter_chunks(documents, splitter, batch=INGEST_BATCH_SIZE):
+    """
+    Lazily split documents and yield (texts, metadatas) batches so chunks
+    are embedded as they are produced rather than materialized up front.
+    """
+    texts, metadatas = [], []
+    for doc in documents:
+        for chunk in splitter.chunks(doc.page_content):
+            texts.append(chunk)
+            metadatas.append(dict(doc.metadata))
+            if len(texts) == batch:
+                yield texts, metadatas
+                texts, metadatas = [], []
+
+    if texts:
+        yield texts, metadatas
+
+
+async def _build_vectorstore(documents, embeddings, quantization):
+    import numpy as np
+    from semantic_text_splitter import TextSplitter
+    from langchain_community.vectorstores import FAISS
+    from langchain_community.docstore.in_memory import InMemoryDocstore
+
+    text_splitter = TextSplitter(capacity=1000, overlap=200)
+
+    docstore = InMemoryDocstore()
+    index_to_docstore_id = {}
+    index = None
+    # IVF+PQ and int8 SQ must be trained on the full corpus (PQ codebooks,
+    # SQ per-dimension ranges), so their vectors are held back as float32
+    # until every batch has been embedded. Flat indexes add batch by batch.
+    pending = []
+
+    for texts, metadatas in _iter_chunks(documents, text_splitter):
+        vectors = np.asarray(await _embed_all(texts, embeddings), dtype="float32")
+
+        ids = [str(uuid.uuid4()) for _ in texts]
+        docstore.add({
+            doc_id: Document(page_content=text, metadata=metadata)
+            for doc_id, text, metadata in zip(ids, texts, metadatas)
+        })
+        index_to_docstore_id.update(enumerate(ids, start=len(index_to_docstore_id)))
+
+        if quantization in ("pq", "int8"):
+            pending.append(vectors)
+        elif index is None:
+            index = build_index(vectors, quantization)
+        else:
+            index.add(vectors)
+
+    if not index_to_docstore_id:
+        raise ValueError("No text chunks to index")
+
+    if pending:
+        index = build_index(np.vstack(pending), quantization)
+
+    return FAISS(
+        embedding_function=embeddings,
+        index=index,
+        docstore=docstore,
+        index_to_docstore_id=index_to_docstore_id,
     )
 
-    docs = text_splitter.split_documents(documents)
 
-    embeddings = OpenAIEmbeddings()
+async def _ingest(documents, quantization):
+    from langchain_openai import OpenAIEmbeddings
+    from langchain_classic.embeddings import CacheBackedEmbeddings
+    from langchain_classic.storage import LocalFileStore
+
+    # The async client is bound to the event loop of this build, so the
+    # ingest pool lives for one build rather than for the process.
+    limits = httpx.Limits(max_connections=INGEST_MAX_CONNECTIONS)
+    async with httpx.AsyncClient(limits=limits) as http_client:
+        # Retries are handled per batch by _embed_batch, not by the client
+        underlying = OpenAIEmbeddings(
+            openai_api_base=OPENAI_API_BASE_INGEST,
+            http_async_client=http_client,
+            max_retries=0
+        )
+        embeddings = CacheBackedEmbeddings.from_bytes_store(
+            underlying,
+            LocalFileStore(EMBEDDING_CACHE_PATH),
+            namespace=underlying.model,
+            key_encoder="sha256"
+        )
+        return await _build_vectorstore(documents, embeddings, quantization)
+
+
+def build_vectorstore(documents, quantization=FAISS_QUANTIZATION):
+    vectorstore = asyncio.run(_ingest(documents, quantization))
+
+    # Save to a staging directory and swap it in by rename: a loaded index
+    # is memory-mapped, so index.faiss must never be rewritten in place.
+    staging = f"{FAISS_PATH}.tmp.{time.time_ns()}"
+    trash = None
+    try:
+        vectorstore.save_local(staging)
+
+        with _INDEX_LOCK:
+            if os.path.exists(FAISS_PATH):
+                trash = f"{FAISS_PATH}.trash.{time.time_ns()}"
+                os.rename(FAISS_PATH, trash)
+            os.rename(staging, FAISS_PATH)
+            _VS_CACHE["mtime"] = None
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    # The new index is already live; the old one can go at leisure
+    if trash is not None:
+        shutil.rmtree(trash, ignore_errors=True)
+
+
+def _run_ingest(job_id: str, url_list: List[str], file_paths: List[str], message: str):
+    """
+    Load sources and build the vectorstore for a queued ingest job.
+    Runs as a background task; the outcome is recorded in JOBS.
+    """
+    job = JOBS[job_id]
+    job.status = "running"
+    try:
+        docs = load_documents(url_list, file_paths)
+        if not docs:
+            raise ValueError("No documents loaded from provided sources")
+
+        with _INGEST_LOCK:
+            build_vectorstore(docs)
+
+        job.result = ProcessResponse(
+            status="success",
+            message=message,
+            documents_loaded=len(docs),
+            urls_processed=len(url_list),
+            files_processed=len(file_paths)
+        )
+        job.message = message
+        job.status = "success"
+    except Exception as e:
+        job.status = "failed"
+        job.message = str(e)
+    finally:
+        shutil.rmtree(job_upload_dir(job_id), ignore_errors=True)
+
+
+def _prune_jobs():
+    finished = [job_id for job_id, job in list(JOBS.items()) if job.status in ("success", "failed")]
+    for job_id in finished[:max(len(JOBS) - MAX_JOBS + 1, 0)]:
+        JOBS.pop(job_id, None)
+
 
-    vectorstore = FAISS.from_documents(docs, embeddings)
-    vectorstore.save_local(FAISS_PATH)
+def create_job():
+    _prune_jobs()
+    job_id = uuid.uuid4().hex
+    JOBS[job_id] = JobStatus(job_id=job_id, status="pending", message="Processing queued")
+    return job_id
+
+
+def has_active_jobs():
+    return any(job.status in ("pending", "running") for job in list(JOBS.values()))
+
+
+def queue_ingest(background_tasks: BackgroundTasks, url_list: List[str], file_paths: List[str], message: str, job_id: Optional[str] = None):
+    job_id = job_id or create_job()
+    background_tasks.add_task(_run_ingest, job_id, url_list, file_paths, message)
+    return job_id
 
 
 def load_vectorstore():
-    return FAISS.load_local(FAISS_PATH, embeddings=OpenAIEmbeddings(), allow_dangerous_deserialization=True)
+    """
+    Return the cached vectorstore, reloading it if the index on disk changed.
+    Raises FileNotFoundError if no index has been built yet.
+    """
+    with _INDEX_LOCK:
+        return _load_vectorstore()
+
+
+def _load_vectorstore():
+    import faiss
+    from langchain_openai import OpenAIEmbeddings
+    from langchain_community.vectorstores import FAISS
+
+    mtime = os.stat(os.path.join(FAISS_PATH, "index.faiss")).st_mtime
+    if _VS_CACHE["store"] is not None and mtime == _VS_CACHE["mtime"]:
+        return _VS_CACHE["store"]
+
+    if _VS_CACHE["emb"] is None:
+        _VS_CACHE["emb"] = CachedQueryEmbeddings(OpenAIEmbeddings(
+            openai_api_base=OPENAI_API_BASE_QUERY,
+            http_client=httpx.Client(limits=httpx.Limits(max_connections=QUERY_MAX_CONNECTIONS))
+        ))
+
+    # Memory-map the index so pages are faulted in on demand instead of
+    # reading the whole file into RAM.
+    index = faiss.read_index(
+        os.path.join(FAISS_PATH, "index.faiss"),
+        faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+    )
+    with open(os.path.join(FAISS_PATH, "index.pkl"), "rb") as f:
+        docstore, index_to_docstore_id = pickle.load(f)
+
+    vectorstore = FAISS(
+        embedding_function=_VS_CACHE["emb"],
+        index=index,
+        docstore=docstore,
+        index_to_docstore_id=index_to_docstore_id,
+    )
+
+    ivf = faiss.try_extract_index_ivf(vectorstore.index)
+    if ivf is not None:
+        ivf.nprobe = FAISS_NPROBE
+    if isinstance(vectorstore.index, faiss.IndexHNSW):
+        vectorstore.index.hnsw.efSearch = FAISS_EF_SEARCH
+
+    _VS_CACHE["store"] = vectorstore
+    _VS_CACHE["mtime"] = mtime
+    return _VS_CACHE["store"]
+
+
+def get_llm():
+    from langchain_openai import ChatOpenAI
+
+    if _VS_CACHE["llm"] is None:
+        _VS_CACHE["llm"] = ChatOpenAI(
+            temperature=0.3,
+            max_completion_tokens=500,
+            openai_api_base=OPENAI_API_BASE_QUERY,
+            http_client=httpx.Client(limits=httpx.Limits(max_connections=QUERY_MAX_CONNECTIONS))
+        )
+    return _VS_CACHE["llm"]
+
+
+def build_chain():
+    """
+    Assemble the QA chain. Sync so the deferred imports and the index
+    load run in the threadpool rather than on the event loop.
+    """
+    from langchain_classic.chains import RetrievalQAWithSourcesChain
+
+    return RetrievalQAWithSourcesChain.from_llm(
+        llm=get_llm(),
+        retriever=load_vectorstore().as_retriever()
+    )
 
 
 # =========================
@@ -125,78 +550,69 @@ async def root():
         "version": "1.0.0"
     }
 
-@app.post("/process-urls")
-async def process_urls(request: ProcessSourcesRequest):
+@app.post("/process-urls", response_model=JobResponse)
+async def process_urls(request: ProcessSourcesRequest, background_tasks: BackgroundTasks):
     """
-    Process one or more URLs (JSON body) to build FAISS vectorstore.
+    Queue one or more URLs (JSON body) to build FAISS vectorstore.
     { "urls": ["https://example.com", "https://another.com"] }
+    Poll /jobs/{job_id} for the result.
     """
     try:
         url_list = [u.strip() for u in (request.urls or []) if u and u.strip()]
         if not url_list:
             raise HTTPException(status_code=400, detail="Please provide at least one URL")
 
-        # Load documents from URLs only
-        docs = load_documents(url_list, [])
-        if not docs:
-            raise HTTPException(status_code=400, detail="No documents loaded from provided URLs")
-
-        # Build vectorstore
-        build_vectorstore(docs)
-
-        return {
-            "status": "success",
-            "message": "URLs processed successfully",
-            "documents_loaded": len(docs),
-            "urls_processed": len(url_list),
-            "files_processed": 0
-        }
+        # Load documents and build vectorstore in the background
+        job_id = queue_ingest(background_tasks, url_list, [], "URLs processed successfully")
+
+        return JobResponse(status="pending", job_id=job_id)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/process-files")
-async def process_files(files: List[UploadFile] = File(...)):
+@app.post("/process-files", response_model=JobResponse)
+async def process_files(background_tasks: BackgroundTasks, files: List[UploadFile] = File(...)):
     """
-    Process one or more uploaded documents (PDF, CSV, TXT, DOCX) to build FAISS vectorstore.
+    Queue one or more uploaded documents (PDF, CSV, TXT, DOCX) to build FAISS vectorstore.
+    Poll /jobs/{job_id} for the result.
     """
     try:
         if not files:
             raise HTTPException(status_code=400, detail="Please upload at least one file")
 
-        uploaded_file_paths: List[str] = []
-        for file in files:
-            if not file or not file.filename:
-                continue
-            file_path = save_uploaded_file(file)
-            uploaded_file_paths.append(file_path)
+        # Register the job before saving so /reset sees the upload in flight
+        job_id = create_job()
+        upload_dir = job_upload_dir(job_id)
+        os.makedirs(upload_dir, exist_ok=True)
 
-        if not uploaded_file_paths:
-            raise HTTPException(status_code=400, detail="No valid files provided")
-
-        # Load documents from files only
-        docs = load_documents([], uploaded_file_paths)
-        if not docs:
-            raise HTTPException(status_code=400, detail="No documents loaded from provided files")
-
-        # Build vectorstore
-        build_vectorstore(docs)
-
-        return {
-            "status": "success",
-            "message": "Files processed successfully",
-            "documents_loaded": len(docs),
-            "urls_processed": 0,
-            "files_processed": len(uploaded_file_paths)
-        }
+        uploaded_file_paths: List[str] = []
+        try:
+            for file in files:
+                if not file or not file.filename:
+                    continue
+                file_path = await save_uploaded_file(file, upload_dir)
+                uploaded_file_paths.append(file_path)
+
+            if not uploaded_file_paths:
+                raise HTTPException(status_code=400, detail="No valid files provided")
+        except Exception:
+            JOBS.pop(job_id, None)
+            shutil.rmtree(upload_dir, ignore_errors=True)
+            raise
+
+        # Load documents and build vectorstore in the background
+        queue_ingest(background_tasks, [], uploaded_file_paths, "Files processed successfully", job_id)
+
+        return JobResponse(status="pending", job_id=job_id)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-# @app.post("/process-sources")
-# async def process_sources(urls: Optional[str] = Form(None), files: Optional[List[UploadFile]] = File(default=None)):
+# Disabled. Re-enabling it also needs `import json` and `Form` from fastapi.
+# @app.post("/process-sources", response_model=JobResponse)
+# async def process_sources(background_tasks: BackgroundTasks, urls: Optional[str] = Form(None), files: Optional[List[UploadFile]] = File(default=None)):
 #     """
 #     Process URLs and uploaded files to build FAISS vectorstore
 #     urls: (Optional) URLs as JSON array string '["url1", "url2"]' or comma-separated 'url1, url2' or single 'url1'
@@ -223,68 +639,66 @@ async def process_files(files: List[UploadFile] = File(...)):
 #             if not isinstance(url_list, list):
 #                 url_list = [url_list]
         
+#         job_id = create_job()
+#         upload_dir = job_upload_dir(job_id)
+#         os.makedirs(upload_dir, exist_ok=True)
+        
 #         uploaded_file_paths = []
         
 #         # Save uploaded files
 #         if files:
 #             for file in files:
 #                 if file and file.filename:
-#                     file_path = save_uploaded_file(file)
+#                     file_path = await save_uploaded_file(file, upload_dir)
 #                     uploaded_file_paths.append(file_path)
         
 #         # Validate that at least one source is provided
 #         if not url_list and not uploaded_file_paths:
 #             raise HTTPException(status_code=400, detail="Please provide at least one URL or file")
         
-#         # Load documents from URLs and files
-#         docs = load_documents(url_list, uploaded_file_paths)
+#         # Load documents and build vectorstore in the background
+#         queue_ingest(background_tasks, url_list, uploaded_file_paths, "Sources processed successfully", job_id)
         
-#         if not docs:
-#             raise HTTPException(status_code=400, detail="No documents loaded from provided sources")
-        
-#         # Build vectorstore
-#         build_vectorstore(docs)
-        
-#         return {
-#             "status": "success",
-#             "message": "Sources processed successfully",
-#             "documents_loaded": len(docs),
-#             "urls_processed": len(url_list),
-#             "files_processed": len(uploaded_file_paths)
-#         }
+#         return JobResponse(status="pending", job_id=job_id)
 #     except json.JSONDecodeError:
 #         raise HTTPException(status_code=400, detail="URLs must be valid JSON array format or comma-separated string")
 #     except Exception as e:
 #         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/query")
+@app.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    """
+    Get the status of a background ingest job
+    """
+    job = JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return job
+
+
+@app.post("/query", response_model=QueryResponse)
 async def query_documents(request: QueryRequest):
     """
     Query the vectorstore and get answers with sources
     """
     try:
-        if not os.path.exists(FAISS_PATH):
+        try:
+            chain = await run_in_threadpool(build_chain)
+        except FileNotFoundError:
             raise HTTPException(status_code=400, detail="Please process sources first")
-        
-        llm = ChatOpenAI(temperature=0.3, max_completion_tokens=500)
-        vectorstore = load_vectorstore()
-
-        chain = RetrievalQAWithSourcesChain.from_llm(
-            llm=llm,
-            retriever=vectorstore.as_retriever()
-        )
 
-        result = chain({"question": request.question}, return_only_outputs=True)
+        result = await run_in_threadpool(chain, {"question": request.question}, return_only_outputs=True)
 
         sources = result.get("sources", "").split("\n") if result.get("sources") else []
         sources = [s.strip() for s in sources if s.strip()]
 
-        return {
-            "status": "success",
-            "answer": result["answer"],
-            "sources": sources
-        }
+        return QueryResponse(
+            status="success",
+            answer=result["answer"],
+            sources=sources
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -294,21 +708,42 @@ async def query_documents(request: QueryRequest):
 # =========================
 # Cleanup
 # =========================
-@app.post("/reset")
-async def reset():
+def discard_path(path: str, background_tasks: BackgroundTasks):
+    """
+    Move a directory aside and delete it in the background.
+    The rename is a single inode operation, so the caller never waits on rmtree.
+    """
+    if not os.path.exists(path):
+        return
+
+    trash = f"{path}.trash.{time.time_ns()}"
+    os.rename(path, trash)
+    background_tasks.add_task(shutil.rmtree, trash, ignore_errors=True)
+
+
+@app.post("/reset", response_model=StatusResponse)
+async def reset(background_tasks: BackgroundTasks):
     """
     Clear FAISS vectorstore and temporary files
     """
     try:
-        if os.path.exists(FAISS_PATH):
-            shutil.rmtree(FAISS_PATH)
+        # A queued or running ingest would republish its index after the
+        # reset and needs its uploads in TEMP_DIR, so refuse until it ends.
+        if has_active_jobs():
+            raise HTTPException(status_code=409, detail="Processing in progress, try again once it completes")
+
+        with _INDEX_LOCK:
+            discard_path(FAISS_PATH, background_tasks)
+            _VS_CACHE["mtime"] = None
+            _VS_CACHE["store"] = None
         
-        if os.path.exists(TEMP_DIR):
-            shutil.rmtree(TEMP_DIR)
+        discard_path(TEMP_DIR, background_tasks)
         
         os.makedirs(TEMP_DIR, exist_ok=True)
         
-        return {"status": "success", "message": "Reset completed"}
+        return StatusResponse(status="success", message="Reset completed")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
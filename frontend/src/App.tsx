@@ -6,14 +6,7 @@ import FileTab from './components/FileTab';
 import ProcessingStatus from './components/ProcessingStatus';
 import QASection from './components/QASection';
 import ResetButton from './components/ResetButton';
-
-interface ProcessingResult {
-  status: string;
-  message: string;
-  documents_loaded: number;
-  urls_processed: number;
-  files_processed: number;
-}
+import type { ProcessingResult } from './jobs';
 
 interface QueryResult {
   status: string;
@@ -1,5 +1,6 @@
 import { useState } from 'react';
 import './FileTab.css';
+import { waitForJob } from '../jobs';
 
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 
@@ -100,7 +101,8 @@ export default function FileTab({ onProcessingStart, onProcessingComplete, isPro
         throw new Error(data.detail || 'Failed to process files');
       }
 
-      const result = await response.json();
+      const { job_id } = await response.json();
+      const result = await waitForJob(API_URL, job_id);
       onProcessingComplete(result);
     } catch (err) {
       setError(err instanceof Error ? err.message : 'An error occurred');
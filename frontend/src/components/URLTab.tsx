@@ -1,5 +1,6 @@
 import { useState } from 'react';
 import './URLTab.css';
+import { waitForJob } from '../jobs';
 
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 
@@ -67,7 +68,8 @@ export default function URLTab({ onProcessingStart, onProcessingComplete, isProc
         throw new Error(data.detail || 'Failed to process URLs');
       }
 
-      const result = await response.json();
+      const { job_id } = await response.json();
+      const result = await waitForJob(API_URL, job_id);
       onProcessingComplete(result);
     } catch (err) {
       setError(err instanceof Error ? err.message : 'An error occurred');
@@ -0,0 +1,33 @@
+const POLL_INTERVAL_MS = 1000;
+const MAX_WAIT_MS = 10 * 60 * 1000;
+
+export interface ProcessingResult {
+  status: string;
+  message: string;
+  documents_loaded: number;
+  urls_processed: number;
+  files_processed: number;
+}
+
+export async function waitForJob(apiUrl: string, jobId: string): Promise<ProcessingResult> {
+  const deadline = Date.now() + MAX_WAIT_MS;
+
+  while (Date.now() < deadline) {
+    const response = await fetch(`${apiUrl}/jobs/${jobId}`);
+    const job = await response.json();
+
+    if (!response.ok) {
+      throw new Error(job.detail || 'Failed to fetch job status');
+    }
+    if (job.status === 'success') {
+      return job.result;
+    }
+    if (job.status === 'failed') {
+      throw new Error(job.message || 'Processing failed');
+    }
+
+    await new Promise((resolve) => setTimeout(resolve, POLL_INTERVAL_MS));
+  }
+
+  throw new Error('Processing timed out');
+}